@@ -1,7 +1,11 @@
 use clap::Parser;
+use memmap2::Mmap;
+use serde::Deserialize;
+use serde_json::json;
+use std::borrow::Cow;
 use std::ffi::c_int;
 use std::fs::File;
-use std::io::{BufReader, BufWriter, Read, Write};
+use std::io::{BufRead, BufReader, BufWriter, Read, Write};
 use std::path::PathBuf;
 
 #[repr(C)]
@@ -100,9 +104,27 @@ struct Args {
     #[arg(long, default_value_t = true)]
     play: bool,
 
-    /// Decode payload from WAV file and print as text
-    #[arg(long, value_name = "WAV")]
-    decode_wav: Option<PathBuf>,
+    /// Play directly from memory without writing the output WAV
+    #[arg(long, conflicts_with = "out")]
+    play_only: bool,
+
+    /// Split long text into frames of at most N bytes, starting playback
+    /// after the first (smaller) frame is encoded
+    #[arg(long, value_name = "N")]
+    chunk_size: Option<usize>,
+
+    /// Size in bytes of the first frame when --chunk-size is used
+    #[arg(long, value_name = "N", default_value_t = 16, requires = "chunk_size")]
+    first_chunk: usize,
+
+    /// Decode payload from one or more WAV files and print as text
+    /// (one `path<TAB>text` line per file when several are given)
+    #[arg(long, value_name = "WAV", num_args = 1..)]
+    decode_wav: Vec<PathBuf>,
+
+    /// Keep running and answer newline-delimited JSON requests on stdin
+    #[arg(long)]
+    serve: bool,
 }
 
 fn parse_protocol(s: &str) -> i32 {
@@ -125,8 +147,23 @@ fn parse_protocol(s: &str) -> i32 {
     }
 }
 
+/// Write buffer for WAV output: large enough that header and samples go out in a few syscalls.
+const WAV_WRITE_BUFFER: usize = 1 << 20;
+
 fn write_wav(path: &PathBuf, sample_rate: u32, sample_format: i32, data: &[u8]) -> std::io::Result<()> {
-    let mut writer = BufWriter::new(File::create(path)?);
+    let mut writer = BufWriter::with_capacity(WAV_WRITE_BUFFER, File::create(path)?);
+    write_wav_to(&mut writer, sample_rate, sample_format, data)?;
+    writer.flush()
+}
+
+/// Build a complete WAV image in memory, for playback without touching disk.
+fn wav_bytes(sample_rate: u32, sample_format: i32, data: &[u8]) -> Vec<u8> {
+    let mut out = Vec::with_capacity(44 + data.len());
+    write_wav_to(&mut out, sample_rate, sample_format, data).expect("writing to a Vec cannot fail");
+    out
+}
+
+fn write_wav_to<W: Write>(writer: &mut W, sample_rate: u32, sample_format: i32, data: &[u8]) -> std::io::Result<()> {
     let num_channels: u16 = 1;
     let bits_per_sample: u16 = match sample_format {
         x if x == ggwave_consts::GGWAVE_SAMPLE_FORMAT_I16 => 16,
@@ -160,27 +197,58 @@ fn write_wav(path: &PathBuf, sample_rate: u32, sample_format: i32, data: &[u8])
     writer.write_all(b"data")?;
     writer.write_all(&data_len.to_le_bytes())?;
     writer.write_all(data)?;
-    writer.flush()?;
     Ok(())
 }
 
 #[derive(Debug)]
-struct WavData {
+struct WavData<'a> {
     sample_rate: u32,
     channels: u16,
     bits_per_sample: u16,
     format_tag: u16, // 1 = PCM, 3 = IEEE float
-    data: Vec<u8>,
+    data: &'a [u8],
 }
 
 fn read_le_u16(buf: &[u8]) -> u16 { u16::from_le_bytes([buf[0], buf[1]]) }
 fn read_le_u32(buf: &[u8]) -> u32 { u32::from_le_bytes([buf[0], buf[1], buf[2], buf[3]]) }
 
-fn read_wav(path: &std::path::Path) -> Result<WavData, String> {
-    let mut f = BufReader::new(File::open(path).map_err(|e| format!("open: {}", e))?);
-    let mut header = [0u8; 12];
-    f.read_exact(&mut header).map_err(|e| format!("read header: {}", e))?;
-    if &header[0..4] != b"RIFF" || &header[8..12] != b"WAVE" {
+/// Raw bytes of a WAV input: memory-mapped for regular files, buffered otherwise.
+enum WavSource {
+    Mapped(Mmap),
+    Buffered(Vec<u8>),
+}
+
+impl std::ops::Deref for WavSource {
+    type Target = [u8];
+    fn deref(&self) -> &[u8] {
+        match self {
+            WavSource::Mapped(m) => m,
+            WavSource::Buffered(v) => v,
+        }
+    }
+}
+
+/// Load a WAV file without copying it onto the heap.
+fn load_wav(path: &std::path::Path) -> Result<WavSource, String> {
+    let file = File::open(path).map_err(|e| format!("open: {}", e))?;
+    // SAFETY: the mapping is read-only and dropped once decoding finishes. Pipes,
+    // empty files and the like cannot be mapped and are read normally instead.
+    match unsafe { Mmap::map(&file) } {
+        Ok(mmap) => Ok(WavSource::Mapped(mmap)),
+        Err(_) => {
+            let mut buf = Vec::new();
+            BufReader::new(file).read_to_end(&mut buf).map_err(|e| format!("read: {}", e))?;
+            Ok(WavSource::Buffered(buf))
+        }
+    }
+}
+
+/// Parse the RIFF header in place; the returned sample data borrows from `bytes`.
+fn parse_wav(bytes: &[u8]) -> Result<WavData<'_>, String> {
+    if bytes.len() < 12 {
+        return Err("read header: file too short".into());
+    }
+    if &bytes[0..4] != b"RIFF" || &bytes[8..12] != b"WAVE" {
         return Err("Not a RIFF/WAVE file".into());
     }
     let mut fmt_chunk_found = false;
@@ -189,16 +257,17 @@ fn read_wav(path: &std::path::Path) -> Result<WavData, String> {
     let mut channels = 1u16;
     let mut sample_rate = 44100u32;
     let mut bits_per_sample = 16u16;
-    let mut data = Vec::new();
-
-    loop {
-        let mut chunk_hdr = [0u8; 8];
-        if f.read_exact(&mut chunk_hdr).is_err() { break; }
-        let id = &chunk_hdr[0..4];
-        let len = read_le_u32(&chunk_hdr[4..8]) as usize;
-        let mut chunk = vec![0u8; len];
-        f.read_exact(&mut chunk).map_err(|e| format!("read chunk: {}", e))?;
-        if len % 2 == 1 { let mut pad = [0u8; 1]; let _ = f.read_exact(&mut pad); }
+    let mut data: &[u8] = &[];
+
+    let mut pos = 12usize;
+    while pos + 8 <= bytes.len() {
+        let id = &bytes[pos..pos + 4];
+        let len = read_le_u32(&bytes[pos + 4..pos + 8]) as usize;
+        let start = pos + 8;
+        let chunk = start.checked_add(len)
+            .and_then(|end| bytes.get(start..end))
+            .ok_or("read chunk: unexpected end of file")?;
+        pos = start + len + (len % 2);
         if id == b"fmt " {
             if len < 16 { return Err("fmt chunk too small".into()); }
             format_tag = read_le_u16(&chunk[0..2]);
@@ -215,10 +284,13 @@ fn read_wav(path: &std::path::Path) -> Result<WavData, String> {
     if !fmt_chunk_found || !data_chunk_found {
         return Err("Missing fmt or data chunk".into());
     }
+    if channels == 0 {
+        return Err("WAV declares zero channels".into());
+    }
     Ok(WavData { sample_rate, channels, bits_per_sample, format_tag, data })
 }
 
-fn downmix_to_mono(w: &WavData) -> Result<(i32, Vec<u8>), String> {
+fn downmix_to_mono<'a>(w: &WavData<'a>) -> Result<(i32, Cow<'a, [u8]>), String> {
     use ggwave_consts::*;
     if w.channels == 1 {
         let fmt = match (w.format_tag, w.bits_per_sample) {
@@ -227,7 +299,8 @@ fn downmix_to_mono(w: &WavData) -> Result<(i32, Vec<u8>), String> {
             (3, 32) => GGWAVE_SAMPLE_FORMAT_F32,
             _ => return Err(format!("Unsupported WAV format tag {} bits {}", w.format_tag, w.bits_per_sample)),
         };
-        return Ok((fmt, w.data.clone()));
+        // Mono input is passed to ggwave as-is, straight out of the mapping
+        return Ok((fmt, Cow::Borrowed(w.data)));
     }
     match (w.format_tag, w.bits_per_sample) {
         (1, 16) => {
@@ -243,7 +316,7 @@ fn downmix_to_mono(w: &WavData) -> Result<(i32, Vec<u8>), String> {
                 let avg = (acc / (w.channels as i32)).clamp(i16::MIN as i32, i16::MAX as i32) as i16;
                 out.extend_from_slice(&avg.to_le_bytes());
             }
-            Ok((GGWAVE_SAMPLE_FORMAT_I16, out))
+            Ok((GGWAVE_SAMPLE_FORMAT_I16, Cow::Owned(out)))
         }
         (1, 8) => {
             let frame_count = w.data.len() / (1 * w.channels as usize);
@@ -258,7 +331,7 @@ fn downmix_to_mono(w: &WavData) -> Result<(i32, Vec<u8>), String> {
                 let avg = (acc / (w.channels as i32)).clamp(0, 255) as u8;
                 out.push(avg);
             }
-            Ok((GGWAVE_SAMPLE_FORMAT_U8, out))
+            Ok((GGWAVE_SAMPLE_FORMAT_U8, Cow::Owned(out)))
         }
         (3, 32) => {
             let frame_count = w.data.len() / (4 * w.channels as usize);
@@ -273,42 +346,110 @@ fn downmix_to_mono(w: &WavData) -> Result<(i32, Vec<u8>), String> {
                 let avg = acc / (w.channels as f32);
                 out.extend_from_slice(&avg.to_le_bytes());
             }
-            Ok((GGWAVE_SAMPLE_FORMAT_F32, out))
+            Ok((GGWAVE_SAMPLE_FORMAT_F32, Cow::Owned(out)))
         }
         _ => Err(format!("Unsupported multi-channel WAV format tag {} bits {}", w.format_tag, w.bits_per_sample)),
     }
 }
 
-fn decode_wav_with_ggwave(path: &std::path::Path) -> Result<Vec<u8>, String> {
-    let wav = read_wav(path)?;
-    let (sample_format_inp, mono_bytes) = downmix_to_mono(&wav)?;
-    unsafe {
-        let mut params = ggwave_getDefaultParameters();
-        params.operatingMode = ggwave_consts::GGWAVE_OPERATING_MODE_RX;
-        params.sampleFormatInp = sample_format_inp;
-        params.sampleRateInp = wav.sample_rate as f32;
-        params.sampleRate = wav.sample_rate as f32;
-
-        let instance = ggwave_init(params);
-        if instance < 0 { return Err("ggwave init failed".into()); }
-
-        let mut cap = 256usize;
-        let decoded = loop {
-            let mut out = vec![0u8; cap];
-            let n = ggwave_ndecode(
-                instance,
-                mono_bytes.as_ptr() as *const _,
-                mono_bytes.len() as c_int,
-                out.as_mut_ptr() as *mut _,
-                out.len() as c_int,
-            );
-            if n == -2 { cap *= 2; if cap > 65536 { break Err("Decoded payload too large".into()); } continue; }
-            if n <= 0 { break Err("No payload decoded".into()); }
-            out.truncate(n as usize);
-            break Ok(out);
+/// An RX ggwave instance reused across inputs that share a sample rate and format.
+struct Decoder {
+    // (instance, sample rate, sample format)
+    current: Option<(ggwave_Instance, u32, i32)>,
+}
+
+impl Decoder {
+    fn new() -> Self {
+        Decoder { current: None }
+    }
+
+    fn instance_for(&mut self, sample_rate: u32, sample_format: i32) -> Result<ggwave_Instance, String> {
+        if let Some((instance, sr, fmt)) = self.current {
+            if sr == sample_rate && fmt == sample_format {
+                return Ok(instance);
+            }
+            self.reset();
+        }
+        unsafe {
+            let mut params = ggwave_getDefaultParameters();
+            params.operatingMode = ggwave_consts::GGWAVE_OPERATING_MODE_RX;
+            params.sampleFormatInp = sample_format;
+            params.sampleRateInp = sample_rate as f32;
+            params.sampleRate = sample_rate as f32;
+
+            let instance = ggwave_init(params);
+            if instance < 0 { return Err("ggwave init failed".into()); }
+            self.current = Some((instance, sample_rate, sample_format));
+            Ok(instance)
+        }
+    }
+
+    fn reset(&mut self) {
+        if let Some((instance, _, _)) = self.current.take() {
+            unsafe { ggwave_free(instance); }
+        }
+    }
+
+    fn decode_file(&mut self, path: &std::path::Path) -> Result<Vec<u8>, String> {
+        let source = load_wav(path)?;
+        self.decode_bytes(&source)
+    }
+
+    fn decode_bytes(&mut self, bytes: &[u8]) -> Result<Vec<u8>, String> {
+        use ggwave_consts::*;
+        let wav = parse_wav(bytes)?;
+        let (sample_format_inp, mono_bytes) = downmix_to_mono(&wav)?;
+        let instance = self.instance_for(wav.sample_rate, sample_format_inp)?;
+
+        // ggwave hands back at most one payload per call, so feed the samples a
+        // frame at a time and collect every payload (chunked saves hold several).
+        let sample_size = match sample_format_inp {
+            GGWAVE_SAMPLE_FORMAT_I16 | GGWAVE_SAMPLE_FORMAT_U16 => 2,
+            GGWAVE_SAMPLE_FORMAT_F32 => 4,
+            _ => 1,
         };
-        ggwave_free(instance);
-        decoded
+        let samples_per_frame = unsafe { ggwave_getDefaultParameters() }.samplesPerFrame.max(1) as usize;
+        let block = samples_per_frame * sample_size;
+
+        let mut text = Vec::new();
+        let mut frames = 0usize;
+        let mut out = [0u8; 256];
+        for piece in mono_bytes.chunks(block) {
+            let n = unsafe {
+                ggwave_ndecode(
+                    instance,
+                    piece.as_ptr() as *const _,
+                    piece.len() as c_int,
+                    out.as_mut_ptr() as *mut _,
+                    out.len() as c_int,
+                )
+            };
+            if n < 0 {
+                // A failed decode may leave the receiver mid-frame; start the next file fresh
+                self.reset();
+                // Joining the frames around a lost one would give wrong text
+                return Err(if n == -2 {
+                    "Decoded payload too large".into()
+                } else {
+                    format!("Frame {} could not be decoded", frames + 1)
+                });
+            }
+            if n > 0 {
+                text.extend_from_slice(&out[..n as usize]);
+                frames += 1;
+            }
+        }
+        if frames == 0 {
+            self.reset();
+            return Err("No payload decoded".into());
+        }
+        Ok(text)
+    }
+}
+
+impl Drop for Decoder {
+    fn drop(&mut self) {
+        self.reset();
     }
 }
 
@@ -345,9 +486,11 @@ fn play_wav_blocking(path: &std::path::Path) -> Result<(), String> {
         ("paplay", &[] as &[&str]),
     ];
     for (cmd, args) in candidates {
+        // Keep the player off our stdout: it carries responses in --serve mode
         if std::process::Command::new(cmd)
             .args(args)
             .arg(path)
+            .stdout(std::process::Stdio::null())
             .spawn()
             .map(|mut c| c.wait().map(|s| s.success()).unwrap_or(false))
             .unwrap_or(false)
@@ -358,22 +501,417 @@ fn play_wav_blocking(path: &std::path::Path) -> Result<(), String> {
     Err("No audio player found".into())
 }
 
+#[cfg(target_os = "windows")]
+fn play_wav_bytes_blocking(wav: &[u8]) -> Result<(), String> {
+    use std::ptr::null_mut;
+
+    const SND_SYNC: u32 = 0x0000;
+    const SND_MEMORY: u32 = 0x0004;
+
+    #[link(name = "winmm")]
+    extern "system" {
+        fn PlaySoundW(pszSound: *const u16, hmod: *mut core::ffi::c_void, fdwSound: u32) -> i32;
+    }
+
+    // With SND_MEMORY the "sound name" points at an in-memory WAV image
+    let ok = unsafe { PlaySoundW(wav.as_ptr() as *const u16, null_mut(), SND_SYNC | SND_MEMORY) };
+    if ok == 0 { Err("PlaySoundW failed".into()) } else { Ok(()) }
+}
+
+#[cfg(not(target_os = "windows"))]
+fn play_wav_bytes_blocking(wav: &[u8]) -> Result<(), String> {
+    use std::process::{Command, Stdio};
+
+    // Players that accept a WAV stream on stdin; afplay does not, so it is only
+    // reached through the temp-file fallback below
+    let candidates = [
+        ("ffplay", &["-nodisp", "-autoexit", "-i", "pipe:0"] as &[&str]),
+        ("aplay", &["-"] as &[&str]),
+        ("paplay", &[] as &[&str]),
+    ];
+    for (cmd, args) in candidates {
+        let Ok(mut child) = Command::new(cmd)
+            .args(args)
+            .stdin(Stdio::piped())
+            .stdout(Stdio::null())
+            .spawn()
+        else { continue };
+        let fed = child.stdin.take().map(|mut stdin| stdin.write_all(wav).is_ok()).unwrap_or(false);
+        if child.wait().map(|s| s.success()).unwrap_or(false) && fed {
+            return Ok(());
+        }
+    }
+
+    // No stdin-capable player (e.g. stock macOS): hand afplay a temporary file.
+    // The players above are not retried here: one that played the clip and then
+    // exited non-zero would play it again.
+    static TEMP_COUNTER: std::sync::atomic::AtomicUsize = std::sync::atomic::AtomicUsize::new(0);
+    let n = TEMP_COUNTER.fetch_add(1, std::sync::atomic::Ordering::Relaxed);
+    let path = std::env::temp_dir().join(format!("gibberlink-{}-{}.wav", std::process::id(), n));
+    std::fs::write(&path, wav).map_err(|e| format!("write temp WAV: {}", e))?;
+    let played = Command::new("afplay")
+        .arg(&path)
+        .stdout(Stdio::null())
+        .status()
+        .map(|s| s.success())
+        .unwrap_or(false);
+    let _ = std::fs::remove_file(&path);
+    if played { Ok(()) } else { Err("No audio player found".into()) }
+}
+
+/// Render decoded payload bytes as text, falling back to hex for non-UTF-8 payloads.
+fn payload_to_string(bytes: Vec<u8>) -> String {
+    match String::from_utf8(bytes) {
+        Ok(s) => s,
+        Err(e) => {
+            let mut hex = String::from("0x");
+            for b in e.into_bytes() { hex.push_str(&format!("{:02x}", b)); }
+            hex
+        }
+    }
+}
+
+/// Split `text` at word boundaries into chunks of at most `max` bytes. The first
+/// chunk is limited to `first` bytes and the limit doubles per chunk up to `max`,
+/// so the first frame is short and playback can start early. Whitespace stays
+/// attached to the preceding word, so the chunks concatenate back to `text`.
+fn split_chunks(text: &str, first: usize, max: usize) -> Vec<&str> {
+    let max = max.max(1);
+    let mut limit = first.clamp(1, max);
+    let mut chunks = Vec::new();
+    let mut start = 0usize;
+    let mut end = 0usize;
+    for word in text.split_inclusive(char::is_whitespace) {
+        if end > start && end - start + word.len() > limit {
+            chunks.push(&text[start..end]);
+            start = end;
+            limit = (limit * 2).min(max);
+        }
+        end += word.len();
+        // A single word longer than the limit is cut at a character boundary
+        while end - start > limit {
+            let mut cut = start + limit;
+            while !text.is_char_boundary(cut) { cut -= 1; }
+            if cut == start { cut = start + text[start..].chars().next().map_or(1, char::len_utf8); }
+            chunks.push(&text[start..cut]);
+            start = cut;
+            limit = (limit * 2).min(max);
+        }
+    }
+    if end > start { chunks.push(&text[start..end]); }
+    chunks
+}
+
+/// A TX-only ggwave instance producing mono 16-bit samples.
+struct Encoder {
+    instance: ggwave_Instance,
+    params: GgwaveParameters,
+}
+
+impl Encoder {
+    fn new(sample_rate: Option<u32>) -> Result<Self, (i32, String)> {
+        unsafe {
+            let mut params = ggwave_getDefaultParameters();
+            // TX only, mono 16-bit output
+            params.operatingMode = ggwave_consts::GGWAVE_OPERATING_MODE_TX;
+            params.sampleFormatOut = ggwave_consts::GGWAVE_SAMPLE_FORMAT_I16;
+            if let Some(sr) = sample_rate { params.sampleRateOut = sr as f32; params.sampleRate = sr as f32; }
+
+            let instance = ggwave_init(params);
+            if instance < 0 {
+                return Err((2, "Failed to init ggwave".into()));
+            }
+            Ok(Encoder { instance, params })
+        }
+    }
+
+    fn encode(&self, text: &str, protocol: &str, volume: i32) -> Result<Vec<u8>, (i32, String)> {
+        let payload = text.as_bytes();
+        let protocol = parse_protocol(protocol);
+        let volume = volume.clamp(0, 100);
+        unsafe {
+            // Query size
+            let nbytes = ggwave_encode(
+                self.instance,
+                payload.as_ptr() as *const _,
+                payload.len() as c_int,
+                protocol,
+                volume,
+                std::ptr::null_mut(),
+                1,
+            );
+            if nbytes <= 0 {
+                return Err((3, "ggwave_encode size query failed".into()));
+            }
+
+            let mut buf = vec![0u8; nbytes as usize];
+            let nwritten = ggwave_encode(
+                self.instance,
+                payload.as_ptr() as *const _,
+                payload.len() as c_int,
+                protocol,
+                volume,
+                buf.as_mut_ptr() as *mut _,
+                0,
+            );
+            if nwritten != nbytes {
+                return Err((4, format!("ggwave_encode wrote {} but expected {}", nwritten, nbytes)));
+            }
+            Ok(buf)
+        }
+    }
+
+    /// Encode `text`, write it to `out` and optionally play it. Returns the status line.
+    fn encode_to_file(&self, text: &str, protocol: &str, volume: i32, out: &PathBuf, play: bool) -> Result<String, (i32, String)> {
+        let buf = self.encode(text, protocol, volume)?;
+        write_wav(out, self.params.sampleRateOut as u32, self.params.sampleFormatOut, &buf)
+            .map_err(|e| (5, format!("Failed to write WAV: {}", e)))?;
+        let mut msg = format!("Wrote {} bytes to {}", buf.len(), out.display());
+        if play {
+            if let Err(e) = play_wav_blocking(out) {
+                msg.push_str(&format!(" (playback failed: {})", e));
+            }
+        }
+        Ok(msg)
+    }
+
+    /// Encode `text` and play it straight from memory without writing a WAV file.
+    fn encode_and_play(&self, text: &str, protocol: &str, volume: i32) -> Result<String, (i32, String)> {
+        let buf = self.encode(text, protocol, volume)?;
+        let wav = wav_bytes(self.params.sampleRateOut as u32, self.params.sampleFormatOut, &buf);
+        play_wav_bytes_blocking(&wav).map_err(|e| (7, format!("Playback failed: {}", e)))?;
+        Ok(format!("Played {} bytes (not saved)", buf.len()))
+    }
+
+    /// Encode `chunks` as back-to-back ggwave frames. With `play`, each chunk is
+    /// handed to a player thread as soon as it is encoded, so playback of one chunk
+    /// overlaps encoding of the next. With `out`, all frames are written as one WAV.
+    fn encode_chunked(
+        &self,
+        chunks: &[&str],
+        protocol: &str,
+        volume: i32,
+        out: Option<&PathBuf>,
+        play: bool,
+        progress: &mut dyn FnMut(usize, usize),
+    ) -> Result<String, (i32, String)> {
+        let sample_rate = self.params.sampleRateOut as u32;
+        let sample_format = self.params.sampleFormatOut;
+        let player = play.then(|| {
+            let (tx, rx) = std::sync::mpsc::channel::<Vec<u8>>();
+            let handle = std::thread::spawn(move || {
+                let mut err = None;
+                for wav in rx {
+                    if let Err(e) = play_wav_bytes_blocking(&wav) { err = Some(e); }
+                }
+                err
+            });
+            (tx, handle)
+        });
+
+        let mut samples = Vec::new();
+        let mut total = 0usize;
+        let mut result = Ok(());
+        for (i, chunk) in chunks.iter().enumerate() {
+            let buf = match self.encode(chunk, protocol, volume) {
+                Ok(buf) => buf,
+                Err(e) => { result = Err(e); break; }
+            };
+            total += buf.len();
+            if let Some((tx, _)) = &player {
+                let _ = tx.send(wav_bytes(sample_rate, sample_format, &buf));
+            }
+            if out.is_some() { samples.extend_from_slice(&buf); }
+            progress(i + 1, chunks.len());
+        }
+        // Closing the channel lets the player finish the queued chunks and exit
+        let play_err = player.and_then(|(tx, handle)| { drop(tx); handle.join().ok().flatten() });
+        result?;
+
+        let mut msg = match out {
+            Some(path) => {
+                write_wav(path, sample_rate, sample_format, &samples)
+                    .map_err(|e| (5, format!("Failed to write WAV: {}", e)))?;
+                format!("Wrote {} bytes in {} chunks to {}", total, chunks.len(), path.display())
+            }
+            None => format!("Played {} bytes in {} chunks (not saved)", total, chunks.len()),
+        };
+        if let Some(e) = play_err {
+            msg.push_str(&format!(" (playback failed: {})", e));
+        }
+        Ok(msg)
+    }
+}
+
+impl Drop for Encoder {
+    fn drop(&mut self) {
+        unsafe { ggwave_free(self.instance); }
+    }
+}
+
+/// One request line in `--serve` mode.
+#[derive(Deserialize)]
+struct ServeRequest {
+    cmd: String,
+    #[serde(default)]
+    text: String,
+    #[serde(default = "default_protocol")]
+    protocol: String,
+    #[serde(default = "default_volume")]
+    volume: i32,
+    #[serde(default = "default_out")]
+    out: PathBuf,
+    #[serde(default)]
+    play: bool,
+    #[serde(default)]
+    play_only: bool,
+    #[serde(default)]
+    chunk_size: Option<usize>,
+    #[serde(default = "default_first_chunk")]
+    first_chunk: usize,
+    #[serde(default)]
+    path: Option<PathBuf>,
+    #[serde(default)]
+    paths: Vec<PathBuf>,
+}
+
+fn default_protocol() -> String { "audible:fast".into() }
+fn default_volume() -> i32 { 25 }
+fn default_out() -> PathBuf { PathBuf::from("gibberlink.wav") }
+fn default_first_chunk() -> usize { 16 }
+
+/// Decode a file named in a `--serve` request. `-` is refused: stdin is the
+/// request channel there, and reading it would swallow later requests.
+fn serve_decode(decoder: &mut Decoder, path: &std::path::Path) -> Result<Vec<u8>, String> {
+    if path.as_os_str() == "-" {
+        return Err("'-' (stdin) cannot be decoded in --serve mode".into());
+    }
+    decoder.decode_file(path)
+}
+
+/// Decode a `--decode-wav` argument; `-` reads the WAV from stdin.
+fn decode_cli_input(decoder: &mut Decoder, path: &std::path::Path) -> Result<Vec<u8>, String> {
+    if path.as_os_str() == "-" {
+        let mut buf = Vec::new();
+        std::io::stdin().read_to_end(&mut buf).map_err(|e| format!("read stdin: {}", e))?;
+        return decoder.decode_bytes(&buf);
+    }
+    decoder.decode_file(path)
+}
+
+/// Handle one request. Long-running requests report intermediate `"partial": true`
+/// lines through `progress` before the final response is returned.
+fn handle_request(
+    encoder: &mut Option<Encoder>,
+    decoder: &mut Decoder,
+    sample_rate: Option<u32>,
+    line: &str,
+    progress: &mut dyn FnMut(serde_json::Value),
+) -> serde_json::Value {
+    let req: ServeRequest = match serde_json::from_str(line) {
+        Ok(r) => r,
+        Err(e) => return json!({ "ok": false, "error": format!("Bad request: {}", e) }),
+    };
+    match req.cmd.as_str() {
+        "encode" => {
+            if req.text.is_empty() {
+                return json!({ "ok": false, "error": "No text provided" });
+            }
+            // Keep the TX instance alive between requests
+            if encoder.is_none() {
+                match Encoder::new(sample_rate) {
+                    Ok(enc) => *encoder = Some(enc),
+                    Err((_, e)) => return json!({ "ok": false, "error": e }),
+                }
+            }
+            let enc = encoder.as_ref().unwrap();
+            let result = if let Some(size) = req.chunk_size {
+                let chunks = split_chunks(&req.text, req.first_chunk, size);
+                let out = (!req.play_only).then_some(&req.out);
+                let mut report = |i: usize, n: usize| {
+                    progress(json!({ "partial": true, "message": format!("Encoded chunk {}/{}", i, n) }));
+                };
+                enc.encode_chunked(&chunks, &req.protocol, req.volume, out, req.play || req.play_only, &mut report)
+            } else if req.play_only {
+                enc.encode_and_play(&req.text, &req.protocol, req.volume)
+            } else {
+                enc.encode_to_file(&req.text, &req.protocol, req.volume, &req.out, req.play)
+            };
+            match result {
+                Ok(msg) => json!({ "ok": true, "message": msg }),
+                Err((_, e)) => json!({ "ok": false, "error": e }),
+            }
+        }
+        "decode" => {
+            if !req.paths.is_empty() {
+                // Stream each file's result as soon as it is decoded
+                for path in &req.paths {
+                    progress(match serve_decode(decoder, path) {
+                        Ok(bytes) => json!({ "partial": true, "path": path, "ok": true, "text": payload_to_string(bytes) }),
+                        Err(e) => json!({ "partial": true, "path": path, "ok": false, "error": format!("Decode failed: {}", e) }),
+                    });
+                }
+                return json!({ "ok": true, "count": req.paths.len() });
+            }
+            let Some(path) = req.path else {
+                return json!({ "ok": false, "error": "No WAV path provided" });
+            };
+            match serve_decode(decoder, path.as_path()) {
+                Ok(bytes) => json!({ "ok": true, "text": payload_to_string(bytes) }),
+                Err(e) => json!({ "ok": false, "error": format!("Decode failed: {}", e) }),
+            }
+        }
+        other => json!({ "ok": false, "error": format!("Unknown command: {}", other) }),
+    }
+}
+
+fn send_line(value: &serde_json::Value) -> std::io::Result<()> {
+    let mut out = std::io::stdout().lock();
+    writeln!(out, "{}", value)?;
+    out.flush()
+}
+
+/// Answer newline-delimited JSON requests on stdin until EOF. Each request gets
+/// zero or more partial lines followed by exactly one final response line.
+fn serve(sample_rate: Option<u32>) {
+    let stdin = std::io::stdin();
+    let mut encoder: Option<Encoder> = None;
+    let mut decoder = Decoder::new();
+    for line in stdin.lock().lines() {
+        let Ok(line) = line else { break };
+        if line.trim().is_empty() { continue; }
+        let mut progress = |v: serde_json::Value| { let _ = send_line(&v); };
+        // A panic on one malformed input must not take down the whole session
+        let handled = std::panic::catch_unwind(std::panic::AssertUnwindSafe(|| {
+            handle_request(&mut encoder, &mut decoder, sample_rate, &line, &mut progress)
+        }));
+        let resp = handled.unwrap_or_else(|panic| {
+            // The ggwave instances may be mid-frame; start both afresh
+            encoder = None;
+            decoder = Decoder::new();
+            let reason = panic.downcast_ref::<&str>().map(|s| s.to_string())
+                .or_else(|| panic.downcast_ref::<String>().cloned())
+                .unwrap_or_else(|| "unknown panic".into());
+            json!({ "ok": false, "error": format!("Internal error: {}", reason) })
+        });
+        if send_line(&resp).is_err() { break; }
+    }
+}
+
 fn main() {
     let args = Args::parse();
     unsafe { ggwave_setLogFile(std::ptr::null_mut()); }
 
+    if args.serve {
+        serve(args.sample_rate);
+        return;
+    }
+
     // Decode mode
-    if let Some(wav) = args.decode_wav.as_ref() {
-        match decode_wav_with_ggwave(wav.as_path()) {
+    if let [wav] = args.decode_wav.as_slice() {
+        match decode_cli_input(&mut Decoder::new(), wav.as_path()) {
             Ok(bytes) => {
-                match String::from_utf8(bytes.clone()) {
-                    Ok(s) => { println!("{}", s); }
-                    Err(_) => {
-                        print!("0x");
-                        for b in bytes { print!("{:02x}", b); }
-                        println!();
-                    }
-                }
+                println!("{}", payload_to_string(bytes));
                 return;
             }
             Err(e) => {
@@ -382,6 +920,21 @@ fn main() {
             }
         }
     }
+    if !args.decode_wav.is_empty() {
+        // Batch: one decoder for all files, one line per file
+        let mut decoder = Decoder::new();
+        let mut failed = false;
+        for wav in &args.decode_wav {
+            match decode_cli_input(&mut decoder, wav.as_path()) {
+                Ok(bytes) => println!("{}\t{}", wav.display(), payload_to_string(bytes)),
+                Err(e) => {
+                    eprintln!("{}\tDecode failed: {}", wav.display(), e);
+                    failed = true;
+                }
+            }
+        }
+        std::process::exit(if failed { 6 } else { 0 });
+    }
 
     // Read text
     let text = match args.text {
@@ -397,69 +950,22 @@ fn main() {
         std::process::exit(1);
     }
 
-    unsafe {
-        let mut params = ggwave_getDefaultParameters();
-        // TX only, mono 16-bit output
-        params.operatingMode = ggwave_consts::GGWAVE_OPERATING_MODE_TX;
-        params.sampleFormatOut = ggwave_consts::GGWAVE_SAMPLE_FORMAT_I16;
-        if let Some(sr) = args.sample_rate { params.sampleRateOut = sr as f32; params.sampleRate = sr as f32; }
-
-        let instance = ggwave_init(params);
-        if instance < 0 {
-            eprintln!("Failed to init ggwave");
-            std::process::exit(2);
-        }
-
-        let payload = text.as_bytes();
-        let protocol = parse_protocol(&args.protocol);
-        let volume = args.volume.clamp(0, 100);
-
-        // Query size
-        let nbytes = ggwave_encode(
-            instance,
-            payload.as_ptr() as *const _,
-            payload.len() as c_int,
-            protocol,
-            volume,
-            std::ptr::null_mut(),
-            1,
-        );
-        if nbytes <= 0 {
-            ggwave_free(instance);
-            eprintln!("ggwave_encode size query failed");
-            std::process::exit(3);
-        }
-
-        let mut buf = vec![0u8; nbytes as usize];
-        let nwritten = ggwave_encode(
-            instance,
-            payload.as_ptr() as *const _,
-            payload.len() as c_int,
-            protocol,
-            volume,
-            buf.as_mut_ptr() as *mut _,
-            0,
-        );
-        if nwritten != nbytes {
-            ggwave_free(instance);
-            eprintln!("ggwave_encode wrote {} but expected {}", nwritten, nbytes);
-            std::process::exit(4);
-        }
-
-        ggwave_free(instance);
-
-        // Write WAV
-        if let Err(e) = write_wav(&args.out, params.sampleRateOut as u32, params.sampleFormatOut, &buf) {
-            eprintln!("Failed to write WAV: {}", e);
-            std::process::exit(5);
+    let result = Encoder::new(args.sample_rate).and_then(|enc| {
+        if let Some(size) = args.chunk_size {
+            let chunks = split_chunks(&text, args.first_chunk, size);
+            let out = (!args.play_only).then_some(&args.out);
+            enc.encode_chunked(&chunks, &args.protocol, args.volume, out, args.play || args.play_only, &mut |_, _| {})
+        } else if args.play_only {
+            enc.encode_and_play(&text, &args.protocol, args.volume)
+        } else {
+            enc.encode_to_file(&text, &args.protocol, args.volume, &args.out, args.play)
         }
-
-        println!("Wrote {} bytes to {}", buf.len(), args.out.display());
-
-        if args.play {
-            if let Err(e) = play_wav_blocking(&args.out) {
-                eprintln!("Playback failed: {}", e);
-            }
+    });
+    match result {
+        Ok(msg) => println!("{}", msg),
+        Err((code, e)) => {
+            eprintln!("{}", e);
+            std::process::exit(code);
         }
     }
 }
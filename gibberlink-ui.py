@@ -13,106 +13,340 @@ Usage examples:
 If the Rust binary is missing, the script will attempt to build it with Cargo.
 """
 
-import argparse
 import os
 import subprocess
 import sys
-from typing import Optional
+from typing import List, Optional
+
+
+# Resolved once at import; the binary location cannot change while we run.
+EXE_NAME = "gibberlink-tx.exe" if os.name == "nt" else "gibberlink-tx"
+# If running from a PyInstaller onefile bundle, data is under sys._MEIPASS
+BUNDLE_DIR = getattr(sys, "_MEIPASS", None)
+# Next to the executable when frozen (onedir) or next to this file when not
+HERE = os.path.dirname(sys.executable) if getattr(sys, "frozen", False) else os.path.dirname(os.path.abspath(__file__))
+DEV_CLI = os.path.join(HERE, "gibberlink-tx", "target", "release", EXE_NAME)
+CANDIDATES = tuple(
+    p for p in (
+        os.path.join(BUNDLE_DIR, EXE_NAME) if BUNDLE_DIR else None,
+        os.path.join(HERE, EXE_NAME),
+        DEV_CLI,
+    ) if p
+)
+
+_BINARY_CACHE: Optional[str] = None
+if BUNDLE_DIR:
+    try:
+        # Generated by the release workflow for the PyInstaller build, so the
+        # bundled CLI is known without probing; absent in source checkouts.
+        from gibberlink_tx_path import BINARY_NAME
+    except ImportError:
+        pass
+    else:
+        _BINARY_CACHE = os.path.join(BUNDLE_DIR, BINARY_NAME)
+
+# Text longer than this (in UTF-8 bytes) is sent as several ggwave frames: a
+# small first one so audio starts quickly, growing up to CHUNK_SIZE.
+CHUNK_THRESHOLD = 64
+CHUNK_SIZE = 64
+FIRST_CHUNK = 16
+
+PROTOCOL_OPTIONS = (
+    "audible:normal", "audible:fast", "audible:fastest",
+    "ultrasound:normal", "ultrasound:fast", "ultrasound:fastest",
+    "dt:normal", "dt:fast", "dt:fastest",
+    "mt:normal", "mt:fast", "mt:fastest",
+)
 
 
 def ensure_binary() -> str:
-    # Prefer a bundled CLI when running as a packaged (PyInstaller) app
-    exe_name = "gibberlink-tx.exe" if os.name == "nt" else "gibberlink-tx"
-    # 1) If running from a PyInstaller onefile bundle, data is under sys._MEIPASS
-    bundle_dir = getattr(sys, "_MEIPASS", None)
-    if bundle_dir:
-        bundled = os.path.join(bundle_dir, exe_name)
-        if os.path.exists(bundled):
-            return bundled
-
-    # 2) Look next to the executable when frozen (onedir) or next to this file when not
-    here = os.path.dirname(sys.executable) if getattr(sys, "frozen", False) else os.path.dirname(os.path.abspath(__file__))
-    local_cli = os.path.join(here, exe_name)
-    if os.path.exists(local_cli):
-        return local_cli
-
-    # 3) Development tree path
-    dev_cli = os.path.join(here, "gibberlink-tx", "target", "release", "gibberlink-tx")
-    if os.name == "nt":
-        dev_cli += ".exe"
-    if os.path.exists(dev_cli):
-        return dev_cli
-
-    # 4) Try building it from source
+    global _BINARY_CACHE
+    if _BINARY_CACHE is not None:
+        return _BINARY_CACHE
+
+    # Prefer a bundled CLI, then one next to us, then the development tree
+    found = next((p for p in CANDIDATES if os.path.exists(p)), None)
+    if found:
+        _BINARY_CACHE = found
+        return found
+
+    # Otherwise try building it from source
     print("Building Rust gibberlink-tx binary (first run only)...", flush=True)
     try:
-        subprocess.check_call(["cargo", "build", "--release"], cwd=os.path.join(here, "gibberlink-tx"))
+        subprocess.check_call(["cargo", "build", "--release"], cwd=os.path.join(HERE, "gibberlink-tx"))
     except FileNotFoundError:
         print("Cargo not found. Please install Rust (https://rustup.rs/) to build the binary.", file=sys.stderr)
         sys.exit(2)
     except subprocess.CalledProcessError as e:
         print(f"Cargo build failed with code {e.returncode}", file=sys.stderr)
         sys.exit(e.returncode)
-    if not os.path.exists(dev_cli):
+    if not os.path.exists(DEV_CLI):
         print("Build succeeded but binary not found. Please check the build output.", file=sys.stderr)
         sys.exit(3)
-    return dev_cli
-def run_ui() -> int:
+    _BINARY_CACHE = DEV_CLI
+    return DEV_CLI
+
+
+def warm_page_cache(exe: str) -> None:
+    """Ask the OS to page in the CLI and any shared libraries next to it.
+
+    Runs in the background while the user is still typing, so the first
+    request does not wait on disk reads.
+    """
+    exe_dir = os.path.dirname(exe)
+    try:
+        siblings = [os.path.join(exe_dir, n) for n in os.listdir(exe_dir) if n.endswith((".so", ".dll", ".dylib"))]
+    except OSError:
+        siblings = []
+    for path in [exe, *siblings]:
+        try:
+            with open(path, "rb") as f:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+                else:
+                    # No fadvise (e.g. Windows): reading the file fills the cache
+                    while f.read(1 << 20):
+                        pass
+        except OSError:
+            pass
+
+
+class TxServer:
+    """A long-lived `gibberlink-tx --serve` process answering JSON requests.
+
+    The UI sends one request per click instead of spawning a new process, so
+    process startup and ggwave initialisation are paid once per session.
+    """
+
+    def __init__(self, exe: str) -> None:
+        # Imported here, not at module level, to keep one-shot CLI startup lean
+        import atexit
+        import queue
+        import threading
+
+        self.exe = exe
+        self._proc: Optional[subprocess.Popen] = None
+        self._stderr = None
+        self._closed = False
+        self._lock = threading.Lock()
+        # Callbacks from worker threads, run on the Tk thread by dispatch_events()
+        self._events: "queue.SimpleQueue" = queue.SimpleQueue()
+        self.pending = 0
+        atexit.register(self.close)
+
+    def _spawn(self) -> Optional[subprocess.Popen]:
+        if self._closed:
+            return None
+        if self._proc is None or self._proc.poll() is not None:
+            # Reap a server that died since the last request and close its stderr file
+            self._terminate()
+            # stderr goes to a temp file rather than a pipe: nobody reads it while
+            # the server runs (a full pipe would stall it), but if the server dies
+            # we can still report why.
+            import tempfile
+
+            self._stderr = tempfile.TemporaryFile()
+            self._proc = subprocess.Popen(
+                [self.exe, "--serve"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=self._stderr,
+            )
+        return self._proc
+
+    def request(self, payload: dict, on_partial=None) -> dict:
+        """Send one request and return the final reply.
+
+        Replies are read line by line as raw bytes; lines marked `"partial"`
+        (e.g. per-file batch decode results) go to `on_partial` as they arrive.
+        """
+        import json
+
+        line = (json.dumps(payload) + "\n").encode("utf-8")
+        closed = {"ok": False, "error": "gibberlink-tx server is closed"}
+
+        def send(proc: subprocess.Popen) -> None:
+            proc.stdin.write(line)
+            proc.stdin.flush()
+
+        with self._lock:
+            proc = self._spawn()
+            if proc is None:
+                return closed
+            try:
+                try:
+                    send(proc)
+                except BrokenPipeError:
+                    # The server exited before reading this request, so nothing
+                    # ran yet and a fresh one can take it. Once a request has
+                    # been written it is never sent again: it may be what made
+                    # the server exit, or it may already have played or saved audio.
+                    self._terminate()
+                    proc = self._spawn()
+                    if proc is None:
+                        return closed
+                    send(proc)
+                for reply in iter(proc.stdout.readline, b""):
+                    msg = json.loads(reply)
+                    if not msg.get("partial"):
+                        return msg
+                    if on_partial is not None:
+                        on_partial(msg)
+            except OSError:
+                pass
+            reason = self._terminate()
+        error = "gibberlink-tx server exited unexpectedly"
+        if reason:
+            error += f": {reason}"
+            if "--serve" in reason:
+                # A binary built before --serve existed; it is not rebuilt automatically
+                error += f" (rebuild with `cargo build --release` in {os.path.join(HERE, 'gibberlink-tx')})"
+        return {"ok": False, "error": error}
+
+    def request_async(self, payload: dict, on_done, on_partial=None) -> None:
+        """Run `request` on a worker thread.
+
+        The callbacks are not called from the worker; they are queued and run
+        by `dispatch_events`, which the UI polls from the Tk thread while
+        `pending` is non-zero.
+        """
+        import threading
+
+        def done(reply: dict) -> None:
+            self.pending -= 1
+            on_done(reply)
+
+        def partial(msg: dict) -> None:
+            self._events.put((on_partial, msg))
+
+        def worker() -> None:
+            try:
+                reply = self.request(payload, partial if on_partial is not None else None)
+            except Exception as e:
+                reply = {"ok": False, "error": f"Failed: {e}"}
+            self._events.put((done, reply))
+
+        self.pending += 1
+        threading.Thread(target=worker, daemon=True).start()
+
+    def dispatch_events(self) -> None:
+        import queue
+
+        while True:
+            try:
+                callback, arg = self._events.get_nowait()
+            except queue.Empty:
+                return
+            callback(arg)
+
+    def close(self) -> None:
+        """Stop the server for good; later requests fail instead of respawning it."""
+        self._closed = True
+        self._terminate()
+
+    def _terminate(self) -> str:
+        """Stop the current server process and return the tail of its stderr."""
+        proc, self._proc = self._proc, None
+        stderr, self._stderr = self._stderr, None
+        if proc is not None:
+            try:
+                proc.stdin.close()
+                proc.wait(timeout=2)
+            except Exception:
+                proc.kill()
+                proc.wait()
+        if stderr is None:
+            return ""
+        with stderr:
+            # Only read once the process is gone: it shares the file offset
+            stderr.seek(0)
+            return stderr.read()[-2000:].decode("utf-8", "replace").strip()
+
+
+def _build_ui(title: str) -> int:
     try:
         import tkinter as tk
         from tkinter import ttk, filedialog
     except Exception as e:
         print(f"Tkinter is not available: {e}", file=sys.stderr)
         return 2
+    import threading
 
     exe = ensure_binary()
+    threading.Thread(target=warm_page_cache, args=(exe,), daemon=True).start()
+    server = TxServer(exe)
 
     root = tk.Tk()
-    root.title("Text → Gibberlink (ggwave)")
+    root.title(title)
     root.geometry("680x520")
 
     mainframe = ttk.Frame(root, padding=12)
     mainframe.pack(fill=tk.BOTH, expand=True)
 
+    # Labels and decorations that never change after the window opens
+    static_widgets = (
+        (ttk.Label, {"text": "Text to encode:"}, {"row": 0, "column": 0, "sticky": "w"}),
+        (ttk.Label, {"text": "Protocol:"}, {"row": 2, "column": 0, "sticky": "w"}),
+        (ttk.Label, {"text": "Volume (0-100):"}, {"row": 2, "column": 2, "sticky": "e"}),
+        (ttk.Label, {"text": "Output file:"}, {"row": 3, "column": 0, "sticky": "w", "pady": (8, 0)}),
+        (
+            ttk.Label,
+            {"text": "Tip: Very high volumes (>50) can distort or be uncomfortable.", "foreground": "#666"},
+            {"row": 6, "column": 0, "columnspan": 4, "sticky": "w", "pady": (6, 0)},
+        ),
+        (ttk.Separator, {"orient": tk.HORIZONTAL}, {"row": 7, "column": 0, "columnspan": 4, "sticky": "ew", "pady": (12, 8)}),
+        (ttk.Label, {"text": "Decode from WAV -> text:"}, {"row": 8, "column": 0, "sticky": "w"}),
+        (ttk.Label, {"text": "Decoded text:"}, {"row": 11, "column": 0, "sticky": "w", "pady": (8, 0)}),
+    )
+    for widget, options, grid in static_widgets:
+        widget(mainframe, **options).grid(**grid)
+
     # Text input
-    ttk.Label(mainframe, text="Text to encode:").grid(row=0, column=0, sticky="w")
     text_box = tk.Text(mainframe, height=5, wrap=tk.WORD)
     text_box.grid(row=1, column=0, columnspan=4, sticky="nsew", pady=(4, 8))
     text_box.insert("1.0", "hello world")
 
     # Protocol dropdown
-    ttk.Label(mainframe, text="Protocol:").grid(row=2, column=0, sticky="w")
     protocol_var = tk.StringVar(value="audible:fast")
-    protocol_options = [
-        "audible:normal", "audible:fast", "audible:fastest",
-        "ultrasound:normal", "ultrasound:fast", "ultrasound:fastest",
-        "dt:normal", "dt:fast", "dt:fastest",
-        "mt:normal", "mt:fast", "mt:fastest",
-    ]
-    protocol_combo = ttk.Combobox(mainframe, textvariable=protocol_var, values=protocol_options, state="readonly")
+    protocol_combo = ttk.Combobox(mainframe, textvariable=protocol_var, values=PROTOCOL_OPTIONS, state="readonly")
     protocol_combo.grid(row=2, column=1, sticky="w")
 
     # Volume slider
-    ttk.Label(mainframe, text="Volume (0-100):").grid(row=2, column=2, sticky="e")
     volume_var = tk.IntVar(value=75)
     volume_slider = ttk.Scale(mainframe, from_=0, to=100, orient=tk.HORIZONTAL, variable=volume_var)
     volume_slider.grid(row=2, column=3, sticky="we")
 
     # Output filename
-    ttk.Label(mainframe, text="Output file:").grid(row=3, column=0, sticky="w", pady=(8, 0))
     out_var = tk.StringVar(value="gibberlink.wav")
     out_entry = ttk.Entry(mainframe, textvariable=out_var)
     out_entry.grid(row=3, column=1, columnspan=3, sticky="we", pady=(8, 0))
 
     # Play checkbox
     play_var = tk.BooleanVar(value=True)
-    play_check = ttk.Checkbutton(mainframe, text="Play after generating", variable=play_var)
-    play_check.grid(row=4, column=0, columnspan=2, sticky="w", pady=(8, 0))
+    ttk.Checkbutton(mainframe, text="Play after generating", variable=play_var).grid(row=4, column=0, columnspan=2, sticky="w", pady=(8, 0))
 
     # Status label
     status_var = tk.StringVar(value="")
     status_label = ttk.Label(mainframe, textvariable=status_var, foreground="#0a0")
-    status_label.grid(row=5, column=0, columnspan=4, sticky="w", pady=(8, 0))
+    status_label.grid(row=5, column=0, columnspan=3, sticky="w", pady=(8, 0))
+
+    # Busy indicator, animated while any request is in flight
+    progress = ttk.Progressbar(mainframe, mode="indeterminate")
+    progress.grid(row=5, column=3, sticky="we", pady=(8, 0))
+
+    def poll() -> None:
+        server.dispatch_events()
+        if server.pending:
+            root.after(50, poll)
+        else:
+            progress.stop()
+
+    def start_request(req: dict, on_done, on_partial=None) -> None:
+        idle = not server.pending
+        server.request_async(req, on_done, on_partial)
+        if idle:
+            progress.start(10)
+            root.after(50, poll)
 
     # Grid weights
     mainframe.columnconfigure(0, weight=0)
@@ -122,95 +356,139 @@ def run_ui() -> int:
     mainframe.rowconfigure(1, weight=1)
     mainframe.rowconfigure(12, weight=1)
 
+    encode_busy = False
+    # WAV actually written by the last successful encode; None after a play-only run
+    last_output: Optional[str] = None
+
     def run_encode() -> None:
+        nonlocal encode_busy
+        if encode_busy:
+            return
         txt = text_box.get("1.0", tk.END).strip()
         if not txt:
             status_var.set("Please enter some text.")
             return
         out_path = out_var.get().strip() or "gibberlink.wav"
         protocol = protocol_var.get()
-        volume = max(0, min(100, int(volume_var.get())))
-        cmd = [exe, "--out", out_path, "--protocol", protocol, "--volume", str(volume)]
-        if play_var.get():
-            cmd.append("--play")
-        # pass text via arg (handles spaces safely)
-        cmd += ["--text", txt]
+        # The slider's from_/to already bound the value
+        volume = int(volume_var.get())
+        assert 0 <= volume <= 100, volume
+        encode_busy = True
+        encode_btn.state(["disabled"])
+        status_label.configure(foreground="#0a0")
         status_var.set("Generating...")
-        root.update_idletasks()
-        try:
-            completed = subprocess.run(cmd, capture_output=True, text=True)
-            if completed.returncode == 0:
-                # Show the CLI stdout (contains 'Wrote N bytes to ...')
-                msg = completed.stdout.strip() or "Done."
-                status_var.set(msg)
+
+        def finish(resp: dict) -> None:
+            nonlocal encode_busy, last_output
+            encode_busy = False
+            encode_btn.state(["!disabled"])
+            if resp.get("ok"):
+                last_output = None if req.get("play_only") else out_path
+                # Show the server message (contains 'Wrote N bytes to ...')
+                status_var.set(resp.get("message") or "Done.")
             else:
-                err = completed.stderr.strip() or completed.stdout.strip() or f"Error code {completed.returncode}"
                 status_label.configure(foreground="#a00")
-                status_var.set(err)
-        except Exception as e:
-            status_label.configure(foreground="#a00")
-            status_var.set(f"Failed: {e}")
-
-    # Buttons
-    btn = ttk.Button(mainframe, text="Generate + Play", command=run_encode)
-    btn.grid(row=4, column=3, sticky="e", pady=(8, 0))
-
-    # Tip
-    tip = ttk.Label(
-        mainframe,
-        text="Tip: Very high volumes (>50) can distort or be uncomfortable.",
-        foreground="#666"
-    )
-    tip.grid(row=6, column=0, columnspan=4, sticky="w", pady=(6, 0))
+                status_var.set(resp.get("error") or "Unknown error")
 
-    # Separator
-    sep = ttk.Separator(mainframe, orient=tk.HORIZONTAL)
-    sep.grid(row=7, column=0, columnspan=4, sticky="ew", pady=(12, 8))
+        req = {"cmd": "encode", "text": txt, "protocol": protocol, "volume": volume}
+        if play_var.get() and out_path == "gibberlink.wav":
+            # Output file left at its default: play from memory and skip the disk round-trip
+            req["play_only"] = True
+        else:
+            req.update(out=out_path, play=play_var.get())
+        if len(txt.encode("utf-8")) > CHUNK_THRESHOLD:
+            req.update(chunk_size=CHUNK_SIZE, first_chunk=FIRST_CHUNK)
+        start_request(req, finish, on_partial=lambda msg: status_var.set(msg.get("message", "")))
 
-    # Decode section: choose WAV and decode to text
-    ttk.Label(mainframe, text="Decode from WAV ? text:").grid(row=8, column=0, sticky="w")
+    encode_btn = ttk.Button(mainframe, text="Generate + Play", command=run_encode)
+    encode_btn.grid(row=4, column=3, sticky="e", pady=(8, 0))
 
+    # Decode section
     decode_path_var = tk.StringVar(value="")
-    decode_entry = ttk.Entry(mainframe, textvariable=decode_path_var)
-    decode_entry.grid(row=9, column=0, columnspan=3, sticky="we", pady=(4, 4))
+    ttk.Entry(mainframe, textvariable=decode_path_var).grid(row=9, column=0, columnspan=3, sticky="we", pady=(4, 4))
+
+    # Files picked with Browse, kept as a list so paths are never re-split;
+    # used for as long as the entry still shows that selection
+    selected_paths: List[str] = []
+    selected_label = ""
 
     def browse_wav():
-        path = filedialog.askopenfilename(title="Choose WAV file", filetypes=[("WAV files", "*.wav"), ("All files", "*.*")])
-        if path:
-            decode_path_var.set(path)
+        nonlocal selected_paths, selected_label
+        paths = filedialog.askopenfilenames(title="Choose WAV file(s)", filetypes=[("WAV files", "*.wav"), ("All files", "*.*")])
+        if paths:
+            selected_paths = list(paths)
+            selected_label = paths[0] if len(paths) == 1 else f"{len(paths)} files selected"
+            decode_path_var.set(selected_label)
 
     ttk.Button(mainframe, text="Browse...", command=browse_wav).grid(row=9, column=3, sticky="e")
 
     def use_last_output():
-        decode_path_var.set(out_var.get().strip())
+        if last_output is None:
+            decoded_box.delete("1.0", tk.END)
+            decoded_box.insert(tk.END, "No WAV file has been written yet. Change the output file or untick Play to save one.")
+            return
+        decode_path_var.set(last_output)
 
     ttk.Button(mainframe, text="Use Last Output", command=use_last_output).grid(row=10, column=0, sticky="w")
 
-    ttk.Label(mainframe, text="Decoded text:").grid(row=11, column=0, sticky="w", pady=(8, 0))
     decoded_box = tk.Text(mainframe, height=6, wrap=tk.WORD)
     decoded_box.grid(row=12, column=0, columnspan=4, sticky="nsew", pady=(4, 8))
 
+    decode_busy = False
+
     def run_decode():
-        path = decode_path_var.get().strip()
+        nonlocal decode_busy
+        if decode_busy:
+            return
+        entry = decode_path_var.get().strip()
+        if selected_paths and entry == selected_label:
+            paths = selected_paths
+        else:
+            paths = [entry] if entry else []
         decoded_box.delete("1.0", tk.END)
-        if not path:
+        if not paths:
             decoded_box.insert(tk.END, "Please choose or provide a WAV path.")
             return
-        cmd = [exe, "--decode-wav", path]
-        completed = subprocess.run(cmd, capture_output=True, text=True)
-        if completed.returncode == 0:
-            decoded_box.insert(tk.END, completed.stdout.strip())
+        decode_busy = True
+        decode_btn.state(["disabled"])
+
+        def show_result(r: dict) -> None:
+            line = r.get("text", "").strip() if r.get("ok") else r.get("error", "")
+            decoded_box.insert(tk.END, f"{r.get('path')}\t{line}\n")
+
+        def finish(resp: dict) -> None:
+            nonlocal decode_busy
+            decode_busy = False
+            decode_btn.state(["!disabled"])
+            if not resp.get("ok"):
+                decoded_box.insert(tk.END, resp.get("error") or "Unknown error")
+            elif "text" in resp:
+                decoded_box.insert(tk.END, resp["text"].strip())
+
+        # A single server request decodes the whole batch with one ggwave instance,
+        # streaming each file's result into the box as soon as it is ready
+        if len(paths) == 1:
+            req = {"cmd": "decode", "path": paths[0]}
         else:
-            msg = completed.stderr.strip() or completed.stdout.strip() or f"Error code {completed.returncode}"
-            decoded_box.insert(tk.END, msg)
+            req = {"cmd": "decode", "paths": paths}
+        start_request(req, finish, on_partial=show_result)
 
-    ttk.Button(mainframe, text="Decode", command=run_decode).grid(row=10, column=3, sticky="e")
+    decode_btn = ttk.Button(mainframe, text="Decode", command=run_decode)
+    decode_btn.grid(row=10, column=3, sticky="e")
 
     root.mainloop()
+    server.close()
     return 0
 
 
+def run_ui() -> int:
+    return _build_ui("Text to Gibberlink (ggwave)")
+
+
 def main() -> int:
+    # Imported here so loading this module (e.g. from launcher.py) stays cheap
+    import argparse
+
     parser = argparse.ArgumentParser(description="Text → Gibberlink audio and play it (via ggwave)")
     parser.add_argument("--text", "-t", help="Text to encode (reads stdin if omitted)")
     parser.add_argument("--protocol", default="audible:fast", help="audible|ultrasound|dt|mt optionally with :normal|fast|fastest")
@@ -218,17 +496,17 @@ def main() -> int:
     parser.add_argument("--out", default="gibberlink.wav", help="Output WAV path (default gibberlink.wav)")
     parser.add_argument("--no-play", dest="play", action="store_false", help="Do not play after generating")
     parser.add_argument("--ui", action="store_true", help="Open a small UI for text + volume")
-    parser.add_argument("--decode", dest="decode_wav", help="Decode payload from WAV -> text and print")
+    parser.add_argument("--decode", dest="decode_wav", nargs="+", help="Decode payload from WAV file(s) -> text and print")
     args = parser.parse_args()
 
     if args.ui:
-        return run_ui_fixed()
+        return run_ui()
 
     exe = ensure_binary()
 
     # Decode CLI mode
     if args.decode_wav:
-        res = subprocess.run([exe, "--decode-wav", args.decode_wav])
+        res = subprocess.run([exe, "--decode-wav", *args.decode_wav])
         return res.returncode
 
     cmd = [exe, "--out", args.out, "--protocol", args.protocol, "--volume", str(args.volume)]
@@ -238,6 +516,10 @@ def main() -> int:
     else:
         input_data = sys.stdin.read().encode("utf-8")
 
+    text_len = len(args.text.encode("utf-8")) if args.text else len(input_data)
+    if text_len > CHUNK_THRESHOLD:
+        cmd += ["--chunk-size", str(CHUNK_SIZE), "--first-chunk", str(FIRST_CHUNK)]
+
     if args.play:
         cmd.append("--play")
 
@@ -245,145 +527,5 @@ def main() -> int:
     return res.returncode
 
 
-def run_ui_fixed() -> int:
-    try:
-        import tkinter as tk
-        from tkinter import ttk, filedialog
-    except Exception as e:
-        print(f"Tkinter is not available: {e}", file=sys.stderr)
-        return 2
-
-    exe = ensure_binary()
-
-    root = tk.Tk()
-    root.title("Text to Gibberlink (ggwave)")
-    root.geometry("680x520")
-
-    mainframe = ttk.Frame(root, padding=12)
-    mainframe.pack(fill=tk.BOTH, expand=True)
-
-    # Text input
-    ttk.Label(mainframe, text="Text to encode:").grid(row=0, column=0, sticky="w")
-    text_box = tk.Text(mainframe, height=5, wrap=tk.WORD)
-    text_box.grid(row=1, column=0, columnspan=4, sticky="nsew", pady=(4, 8))
-    text_box.insert("1.0", "hello world")
-
-    # Protocol dropdown
-    ttk.Label(mainframe, text="Protocol:").grid(row=2, column=0, sticky="w")
-    protocol_var = tk.StringVar(value="audible:fast")
-    protocol_options = [
-        "audible:normal", "audible:fast", "audible:fastest",
-        "ultrasound:normal", "ultrasound:fast", "ultrasound:fastest",
-        "dt:normal", "dt:fast", "dt:fastest",
-        "mt:normal", "mt:fast", "mt:fastest",
-    ]
-    protocol_combo = ttk.Combobox(mainframe, textvariable=protocol_var, values=protocol_options, state="readonly")
-    protocol_combo.grid(row=2, column=1, sticky="w")
-
-    # Volume slider
-    ttk.Label(mainframe, text="Volume (0-100):").grid(row=2, column=2, sticky="e")
-    volume_var = tk.IntVar(value=75)
-    volume_slider = ttk.Scale(mainframe, from_=0, to=100, orient=tk.HORIZONTAL, variable=volume_var)
-    volume_slider.grid(row=2, column=3, sticky="we")
-
-    # Output filename
-    ttk.Label(mainframe, text="Output file:").grid(row=3, column=0, sticky="w", pady=(8, 0))
-    out_var = tk.StringVar(value="gibberlink.wav")
-    out_entry = ttk.Entry(mainframe, textvariable=out_var)
-    out_entry.grid(row=3, column=1, columnspan=3, sticky="we", pady=(8, 0))
-
-    # Play checkbox
-    play_var = tk.BooleanVar(value=True)
-    ttk.Checkbutton(mainframe, text="Play after generating", variable=play_var).grid(row=4, column=0, columnspan=2, sticky="w", pady=(8, 0))
-
-    # Status label
-    status_var = tk.StringVar(value="")
-    status_label = ttk.Label(mainframe, textvariable=status_var, foreground="#0a0")
-    status_label.grid(row=5, column=0, columnspan=4, sticky="w", pady=(8, 0))
-
-    # Grid weights
-    mainframe.columnconfigure(0, weight=0)
-    mainframe.columnconfigure(1, weight=1)
-    mainframe.columnconfigure(2, weight=0)
-    mainframe.columnconfigure(3, weight=1)
-    mainframe.rowconfigure(1, weight=1)
-    mainframe.rowconfigure(12, weight=1)
-
-    def run_encode() -> None:
-        txt = text_box.get("1.0", tk.END).strip()
-        if not txt:
-            status_var.set("Please enter some text.")
-            return
-        out_path = out_var.get().strip() or "gibberlink.wav"
-        protocol = protocol_var.get()
-        volume = max(0, min(100, int(volume_var.get())))
-        cmd = [exe, "--out", out_path, "--protocol", protocol, "--volume", str(volume)]
-        if play_var.get():
-            cmd.append("--play")
-        cmd += ["--text", txt]
-        status_var.set("Generating...")
-        root.update_idletasks()
-        try:
-            completed = subprocess.run(cmd, capture_output=True, text=True)
-            if completed.returncode == 0:
-                msg = completed.stdout.strip() or "Done."
-                status_var.set(msg)
-            else:
-                err = completed.stderr.strip() or completed.stdout.strip() or f"Error code {completed.returncode}"
-                status_label.configure(foreground="#a00")
-                status_var.set(err)
-        except Exception as e:
-            status_label.configure(foreground="#a00")
-            status_var.set(f"Failed: {e}")
-
-    ttk.Button(mainframe, text="Generate + Play", command=run_encode).grid(row=4, column=3, sticky="e", pady=(8, 0))
-
-    # Tip
-    ttk.Label(mainframe, text="Tip: Very high volumes (>50) can distort or be uncomfortable.", foreground="#666").grid(row=6, column=0, columnspan=4, sticky="w", pady=(6, 0))
-
-    # Separator
-    ttk.Separator(mainframe, orient=tk.HORIZONTAL).grid(row=7, column=0, columnspan=4, sticky="ew", pady=(12, 8))
-
-    # Decode section
-    ttk.Label(mainframe, text="Decode from WAV -> text:").grid(row=8, column=0, sticky="w")
-
-    decode_path_var = tk.StringVar(value="")
-    ttk.Entry(mainframe, textvariable=decode_path_var).grid(row=9, column=0, columnspan=3, sticky="we", pady=(4, 4))
-
-    def browse_wav():
-        path = filedialog.askopenfilename(title="Choose WAV file", filetypes=[("WAV files", "*.wav"), ("All files", "*.*")])
-        if path:
-            decode_path_var.set(path)
-
-    ttk.Button(mainframe, text="Browse...", command=browse_wav).grid(row=9, column=3, sticky="e")
-
-    def use_last_output():
-        decode_path_var.set(out_var.get().strip())
-
-    ttk.Button(mainframe, text="Use Last Output", command=use_last_output).grid(row=10, column=0, sticky="w")
-
-    ttk.Label(mainframe, text="Decoded text:").grid(row=11, column=0, sticky="w", pady=(8, 0))
-    decoded_box = tk.Text(mainframe, height=6, wrap=tk.WORD)
-    decoded_box.grid(row=12, column=0, columnspan=4, sticky="nsew", pady=(4, 8))
-
-    def run_decode():
-        path = decode_path_var.get().strip()
-        decoded_box.delete("1.0", tk.END)
-        if not path:
-            decoded_box.insert(tk.END, "Please choose or provide a WAV path.")
-            return
-        completed = subprocess.run([exe, "--decode-wav", path], capture_output=True, text=True)
-        if completed.returncode == 0:
-            decoded_box.insert(tk.END, completed.stdout.strip())
-        else:
-            msg = completed.stderr.strip() or completed.stdout.strip() or f"Error code {completed.returncode}"
-            decoded_box.insert(tk.END, msg)
-
-    ttk.Button(mainframe, text="Decode", command=run_decode).grid(row=10, column=3, sticky="e")
-
-    root.mainloop()
-    return 0
-
-
 if __name__ == "__main__":
     raise SystemExit(main())
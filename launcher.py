@@ -5,9 +5,11 @@ Double‑click this file on Windows, or run:
 
     python launcher.py
 
-It delegates to `gibberlink-ui.py --ui` so you always get the latest UI.
+It loads `gibberlink-ui.py` in-process and opens its UI, so you always get
+the latest UI without starting a second interpreter.
 """
 
+import importlib.util
 import os
 import subprocess
 import sys
@@ -19,6 +21,15 @@ def main() -> int:
     if not os.path.exists(wrapper):
         print("Could not find gibberlink-ui.py next to launcher.py", file=sys.stderr)
         return 2
+    try:
+        spec = importlib.util.spec_from_file_location("gibberlink_ui", wrapper)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        run_ui = mod.run_ui
+    except Exception as e:
+        print(f"Could not load gibberlink-ui.py in-process ({e}); starting it separately", file=sys.stderr)
+    else:
+        return run_ui()  # Blocks until UI closes
     try:
         return subprocess.call([sys.executable, wrapper, "--ui"])  # Blocks until UI closes
     except Exception as e: